@@ -56,6 +56,12 @@ def parse_args() -> argparse.Namespace:
         default=500.0,
         help="Minimum liquidity filter (default: 500)",
     )
+    parser.add_argument(
+        "--max-markets",
+        type=int,
+        default=100,
+        help="Maximum markets to fetch per cycle (default: 100)",
+    )
     parser.add_argument(
         "--once",
         action="store_true",
@@ -66,6 +72,24 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Enable real-time trade streaming via WebSocket",
     )
+    parser.add_argument(
+        "--parquet-dir",
+        type=str,
+        default=None,
+        help="Also write market snapshots to daily Parquet files here (requires pyarrow)",
+    )
+    durability = parser.add_mutually_exclusive_group()
+    durability.add_argument(
+        "--durability",
+        choices=["off", "normal", "full"],
+        default="normal",
+        help="SQLite sync level; 'off' skips fsync (may corrupt DB on OS crash)",
+    )
+    durability.add_argument(
+        "--unsafe-fast",
+        action="store_true",
+        help="Alias for --durability off",
+    )
     parser.add_argument(
         "--daemon",
         action="store_true",
@@ -96,6 +120,7 @@ async def main() -> int:
     logger.info(f"  Interval: {args.interval}s")
     logger.info(f"  Min Volume: ${args.min_volume:,.0f}")
     logger.info(f"  Min Liquidity: ${args.min_liquidity:,.0f}")
+    logger.info(f"  Max Markets: {args.max_markets}")
 
     # Create clients
     gamma_client = GammaClient()
@@ -105,11 +130,12 @@ async def main() -> int:
         min_volume=args.min_volume,
         min_liquidity=args.min_liquidity,
         interval_seconds=args.interval,
+        max_markets=args.max_markets,
+        unsafe_fast=args.unsafe_fast,
+        durability=args.durability,
+        parquet_dir=args.parquet_dir,
     )
 
-    # Initialize database
-    await recorder.init_db()
-
     # Handle shutdown signals
     shutdown_event = asyncio.Event()
 
@@ -124,6 +150,9 @@ async def main() -> int:
             loop.add_signal_handler(sig, lambda s=sig: handle_signal(s))
 
     try:
+        # Initialize database
+        await recorder.init_db()
+
         if args.once:
             # Single recording cycle
             count = await recorder.record_once()
@@ -154,10 +183,19 @@ async def main() -> int:
         return 1
     finally:
         await recorder.close()
+        await gamma_client.close()
         logger.info("Data recorder stopped")
 
     return 0
 
 
 if __name__ == "__main__":
+    # uvloop is a faster drop-in event loop; fall back to asyncio without it
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+
+    if uvloop is not None:
+        sys.exit(uvloop.run(main()))
     sys.exit(asyncio.run(main()))
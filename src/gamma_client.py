@@ -1,15 +1,50 @@
 """Polymarket Gamma API client for fetching market data."""
 
-import json
 import httpx
+import msgspec
 import asyncio
-from typing import List
+import time
+from typing import List, Optional
 import logging
 
-from .models import Market, Token
+from .models import Market, RawMarket
 
 logger = logging.getLogger(__name__)
 
+# Split a page into raw per-market slices so one bad market doesn't fail the page
+_PAGE_DECODER = msgspec.json.Decoder(List[msgspec.Raw])
+# strict=False accepts numbers sent as strings (e.g. "volume": "1234.5")
+_MARKET_DECODER = msgspec.json.Decoder(RawMarket, strict=False)
+
+
+class AsyncTokenBucket:
+    """Token bucket rate limiter for asyncio code.
+
+    Bursts up to `capacity` requests go through immediately; beyond that,
+    callers wait just long enough for the bucket to refill at `rate`/sec.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def take(self) -> None:
+        """Wait until a token is available, then consume it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._last) * self.rate
+                )
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
 
 class GammaClient:
     """Client for Polymarket Gamma API."""
@@ -19,17 +54,47 @@ class GammaClient:
         base_url: str = "https://gamma-api.polymarket.com",
         rate_limit_per_second: int = 5,
         timeout: float = 30.0,
+        max_connections: int = 32,
+        http2: bool = True,
     ):
         self.base_url = base_url
         self.rate_limit_per_second = rate_limit_per_second
         self.timeout = timeout
-        self._rate_limiter_delay = 1.0 / rate_limit_per_second
+        self.max_connections = max_connections
+        self.http2 = http2
+        # Parsed once; each poll only encodes its query params
+        self._markets_url = httpx.URL(f"{base_url}/markets")
+        self._bucket = AsyncTokenBucket(rate_limit_per_second)
+        self._semaphore = asyncio.Semaphore(rate_limit_per_second)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections // 2,
+                ),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
 
     async def fetch_markets(
         self,
         limit: int = 100,
         offset: int = 0,
         active_only: bool = True,
+        min_volume: Optional[float] = None,
+        min_liquidity: Optional[float] = None,
     ) -> List[Market]:
         """
         Fetch markets from Gamma API.
@@ -38,132 +103,104 @@ class GammaClient:
             limit: Number of markets to fetch
             offset: Offset for pagination
             active_only: Only fetch active markets
+            min_volume: Server-side minimum volume filter
+            min_liquidity: Server-side minimum liquidity filter
 
         Returns:
             List of Market objects
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                params = {"limit": limit, "offset": offset}
-
-                if active_only:
-                    params["closed"] = "false"
-
-                response = await client.get(
-                    f"{self.base_url}/markets",
-                    params=params,
+            client = self._get_client()
+            params = {"limit": limit, "offset": offset}
+
+            if active_only:
+                params["closed"] = "false"
+            if min_volume is not None:
+                params["volume_num_min"] = min_volume
+            if min_liquidity is not None:
+                params["liquidity_num_min"] = min_liquidity
+
+            # Rate limiting
+            await self._bucket.take()
+            async with self._semaphore:
+                response = await client.get(self._markets_url, params=params)
+
+            if response.status_code != 200:
+                # Log a bounded slice of the raw body rather than decoding it all
+                logger.error(
+                    f"Gamma API error: {response.status_code} - "
+                    f"{response.content[:512]!r}"
                 )
+                return []
 
-                # Rate limiting
-                await asyncio.sleep(self._rate_limiter_delay)
-
-                if response.status_code != 200:
-                    logger.error(
-                        f"Gamma API error: {response.status_code} - {response.text}"
-                    )
-                    return []
-
-                data = response.json()
-
-                # Parse markets
-                markets = []
-                for item in data:
-                    try:
-                        market = self._parse_market(item)
-                        markets.append(market)
-                    except Exception as e:
-                        logger.warning(f"Failed to parse market: {e}")
-                        continue
-
-                return markets
+            # Decode and parse off the event loop so streaming tasks aren't starved
+            return await asyncio.to_thread(self._parse_markets, response.content)
 
         except Exception as e:
             logger.error(f"Failed to fetch markets: {e}")
             return []
 
-    def _parse_market(self, data: dict) -> Market:
-        """Parse API response into Market object."""
-        # Parse outcomes string to list
-        outcomes_str = data.get("outcomes", "[]")
-        try:
-            outcomes = (
-                json.loads(outcomes_str) if isinstance(outcomes_str, str) else outcomes_str
-            )
-        except:
-            outcomes = []
+    async def fetch_all_markets(
+        self,
+        total_limit: int = 500,
+        page_size: int = 100,
+        active_only: bool = True,
+        min_volume: Optional[float] = None,
+        min_liquidity: Optional[float] = None,
+    ) -> List[Market]:
+        """
+        Fetch several pages of markets concurrently.
 
-        # Parse outcome prices
-        prices_str = data.get("outcomePrices", "[]")
-        try:
-            prices = json.loads(prices_str) if isinstance(prices_str, str) else prices_str
-        except:
-            prices = []
+        Pages are requested in parallel, paced by the token bucket and
+        bounded to rate_limit_per_second requests in flight.
 
-        # Parse token IDs
-        token_ids_str = data.get("clobTokenIds", "[]")
-        try:
-            token_ids = (
-                json.loads(token_ids_str) if isinstance(token_ids_str, str) else token_ids_str
+        Args:
+            total_limit: Maximum number of markets to fetch
+            page_size: Number of markets per request
+            active_only: Only fetch active markets
+            min_volume: Server-side minimum volume filter
+            min_liquidity: Server-side minimum liquidity filter
+
+        Returns:
+            List of Market objects in API order
+        """
+        pages = await asyncio.gather(
+            *(
+                self.fetch_markets(
+                    limit=min(page_size, total_limit - offset),
+                    offset=offset,
+                    active_only=active_only,
+                    min_volume=min_volume,
+                    min_liquidity=min_liquidity,
+                )
+                for offset in range(0, total_limit, page_size)
             )
-        except:
-            token_ids = []
-
-        # Build tokens from outcomes, prices, and token IDs
-        tokens = []
-        for i, outcome in enumerate(outcomes or []):
-            price = float(prices[i]) if i < len(prices) else 0.0
-            token_id = token_ids[i] if i < len(token_ids) else ""
-            tokens.append(Token(token_id=token_id, outcome=outcome, price=price))
-
-        # Parse tags
-        tags_raw = data.get("tags", [])
-        if isinstance(tags_raw, str):
-            try:
-                tags = json.loads(tags_raw)
-            except:
-                tags = []
-        else:
-            tags = tags_raw if tags_raw else []
-
-        # Create market
-        market = Market(
-            market_id=data.get("conditionId", "")
-            or data.get("condition_id", "")
-            or str(data.get("id", "")),
-            title=data.get("question", ""),
-            volume_24h=float(data.get("volume", 0)),
-            liquidity=float(data.get("liquidity", 0)),
-            end_time=data.get("endDate", "") or data.get("end_date_iso", ""),
-            tokens=tokens,
-            outcomes=outcomes,
-            best_bid=data.get("bestBid"),
-            best_ask=data.get("bestAsk"),
-            last_trade_price=data.get("lastTradePrice"),
-            competitive=data.get("competitive"),
-            numeric_id=str(data.get("id", "")),
-            slug=data.get("slug", ""),
-            condition_id=data.get("conditionId", "") or data.get("condition_id", ""),
-            start_time=data.get("startDate", "") or data.get("start_date_iso", ""),
-            active=data.get("active"),
-            closed=data.get("closed"),
-            archived=data.get("archived"),
-            description=data.get("description"),
-            category=data.get("category"),
-            tags=tags,
-            image=data.get("image"),
-            resolution_source=data.get("resolutionSource"),
-            resolved=data.get("resolved"),
-            resolution_outcome=data.get("outcome"),
         )
+        return [market for page in pages for market in page]
 
-        return market
+    def _parse_markets(self, content: bytes) -> List[Market]:
+        """Parse a raw /markets response body into Market objects."""
+        markets = []
+        for item in _PAGE_DECODER.decode(content):
+            try:
+                market = _MARKET_DECODER.decode(item).to_market()
+                markets.append(market)
+            except Exception as e:
+                logger.warning(f"Failed to parse market: {e}")
+                continue
 
-    def filter_by_volume(self, markets: List[Market], min_volume: float) -> List[Market]:
-        """Filter markets by minimum 24h volume."""
-        return [m for m in markets if m.volume_24h >= min_volume]
+        return markets
 
-    def filter_by_liquidity(
-        self, markets: List[Market], min_liquidity: float
+    def filter_markets(
+        self,
+        markets: List[Market],
+        *,
+        min_volume: float = 0.0,
+        min_liquidity: float = 0.0,
     ) -> List[Market]:
-        """Filter markets by minimum liquidity."""
-        return [m for m in markets if m.liquidity >= min_liquidity]
+        """Filter markets by minimum 24h volume and liquidity in one pass."""
+        return [
+            m
+            for m in markets
+            if m.volume_24h >= min_volume and m.liquidity >= min_liquidity
+        ]
@@ -1,8 +1,22 @@
-"""Pydantic models for Polymarket data collection."""
+"""msgspec models for Polymarket data collection."""
 
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field, ConfigDict, computed_field
+from itertools import zip_longest
+from typing import Any, List, Optional, Union
+
+import msgspec
+
+_LIST_DECODER = msgspec.json.Decoder(list)
+
+
+def _decode_list(value: Any) -> list:
+    """Decode a JSON-encoded list field; the API may also send a plain list."""
+    if isinstance(value, str):
+        try:
+            return _LIST_DECODER.decode(value)
+        except msgspec.DecodeError:
+            return []
+    return value or []
 
 
 # =============================================================================
@@ -10,24 +24,23 @@ from pydantic import BaseModel, Field, ConfigDict, computed_field
 # =============================================================================
 
 
-class Token(BaseModel):
+class Token(msgspec.Struct, frozen=True, gc=False):
     """Token (outcome) in a market."""
     token_id: str
     outcome: str
     price: float
 
 
-class Market(BaseModel):
+class Market(msgspec.Struct):
     """Polymarket market data from Gamma API."""
-    model_config = ConfigDict(arbitrary_types_allowed=True)
 
     market_id: str
     title: str
     volume_24h: float
     liquidity: float
     end_time: str
-    tokens: List[Token] = Field(default_factory=list)
-    outcomes: Optional[List[str]] = Field(default_factory=list)
+    tokens: List[Token] = msgspec.field(default_factory=list)
+    outcomes: Optional[List[str]] = msgspec.field(default_factory=list)
     best_bid: Optional[float] = None
     best_ask: Optional[float] = None
     last_trade_price: Optional[float] = None
@@ -41,19 +54,108 @@ class Market(BaseModel):
     archived: Optional[bool] = None
     description: Optional[str] = None
     category: Optional[str] = None
-    tags: Optional[List[str]] = Field(default_factory=list)
+    tags: Optional[List[str]] = msgspec.field(default_factory=list)
     image: Optional[str] = None
     resolution_source: Optional[str] = None
     resolved: Optional[bool] = None
     resolution_outcome: Optional[str] = None
 
 
+class RawMarket(msgspec.Struct, rename="camel"):
+    """Market as returned by the Gamma /markets endpoint (API field names)."""
+
+    id: Union[str, int, None] = ""
+    question: Optional[str] = ""
+    condition_id: Optional[str] = ""
+    legacy_condition_id: Optional[str] = msgspec.field(default="", name="condition_id")
+    slug: Optional[str] = ""
+    volume: float = 0.0
+    liquidity: float = 0.0
+    end_date: Optional[str] = ""
+    end_date_iso: Optional[str] = msgspec.field(default="", name="end_date_iso")
+    start_date: Optional[str] = ""
+    start_date_iso: Optional[str] = msgspec.field(default="", name="start_date_iso")
+    # JSON-encoded lists, e.g. '["Yes", "No"]'
+    outcomes: Union[str, list, None] = "[]"
+    outcome_prices: Union[str, list, None] = "[]"
+    clob_token_ids: Union[str, list, None] = "[]"
+    best_bid: Optional[float] = None
+    best_ask: Optional[float] = None
+    last_trade_price: Optional[float] = None
+    competitive: Optional[float] = None
+    active: Optional[bool] = None
+    closed: Optional[bool] = None
+    archived: Optional[bool] = None
+    description: Optional[str] = None
+    category: Optional[str] = None
+    tags: Union[str, list, None] = None
+    image: Optional[str] = None
+    resolution_source: Optional[str] = None
+    resolved: Optional[bool] = None
+    outcome: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        """Fold legacy snake_case keys into their camelCase counterparts."""
+        self.condition_id = self.condition_id or self.legacy_condition_id
+        self.end_date = self.end_date or self.end_date_iso
+        self.start_date = self.start_date or self.start_date_iso
+
+    def to_market(self) -> "Market":
+        """Convert to the internal Market model."""
+        outcomes = _decode_list(self.outcomes)
+        prices = _decode_list(self.outcome_prices)
+        token_ids = _decode_list(self.clob_token_ids)
+
+        # Build tokens from outcomes, prices, and token IDs (missing -> 0.0 / "")
+        n = len(outcomes)
+        tokens = [
+            Token(
+                token_id=token_id or "",
+                outcome=outcome,
+                price=float(price) if price is not None else 0.0,
+            )
+            for outcome, price, token_id in zip_longest(
+                outcomes, prices[:n], token_ids[:n]
+            )
+        ]
+
+        numeric_id = str(self.id) if self.id is not None else ""
+
+        return Market(
+            market_id=self.condition_id or numeric_id,
+            title=self.question,
+            volume_24h=self.volume,
+            liquidity=self.liquidity,
+            end_time=self.end_date,
+            tokens=tokens,
+            outcomes=outcomes,
+            best_bid=self.best_bid,
+            best_ask=self.best_ask,
+            last_trade_price=self.last_trade_price,
+            competitive=self.competitive,
+            numeric_id=numeric_id,
+            slug=self.slug,
+            condition_id=self.condition_id,
+            start_time=self.start_date,
+            active=self.active,
+            closed=self.closed,
+            archived=self.archived,
+            description=self.description,
+            category=self.category,
+            tags=_decode_list(self.tags),
+            image=self.image,
+            resolution_source=self.resolution_source,
+            resolved=self.resolved,
+            resolution_outcome=self.outcome,
+        )
+
+
 # =============================================================================
 # Snapshot Models (stored in SQLite)
 # =============================================================================
 
 
-class MarketSnapshot(BaseModel):
+class MarketSnapshot(msgspec.Struct):
     """Snapshot of a binary market at a point in time."""
 
     timestamp: datetime
@@ -68,27 +170,26 @@ class MarketSnapshot(BaseModel):
     category: Optional[str] = None
     end_time: Optional[str] = None
     active: Optional[bool] = None
+    parity_gap: float = 0.0  # derived, set in __post_init__
+    spread: Optional[float] = None  # derived, set in __post_init__
 
-    @computed_field
-    @property
-    def parity_gap(self) -> float:
-        """Calculate parity gap: 1 - yes - no.
+    def __post_init__(self) -> None:
+        """Compute derived fields once at construction.
 
+        parity_gap = 1 - yes - no
         Positive = prices sum to less than 1 (buy both for profit)
         Negative = prices sum to more than 1 (sell both for profit)
-        """
-        return round(1.0 - self.yes_price - self.no_price, 6)
 
-    @computed_field
-    @property
-    def spread(self) -> Optional[float]:
-        """Calculate bid-ask spread."""
+        spread = best_ask - best_bid, if both sides are known
+        """
+        self.parity_gap = round(1.0 - self.yes_price - self.no_price, 6)
         if self.best_bid is not None and self.best_ask is not None:
-            return round(self.best_ask - self.best_bid, 6)
-        return None
+            self.spread = round(self.best_ask - self.best_bid, 6)
+        else:
+            self.spread = None
 
 
-class OutcomeSnapshot(BaseModel):
+class OutcomeSnapshot(msgspec.Struct):
     """Snapshot of a single outcome in a multi-outcome market."""
 
     timestamp: datetime
@@ -98,7 +199,7 @@ class OutcomeSnapshot(BaseModel):
     token_id: Optional[str] = None
 
 
-class OrderBookSnapshot(BaseModel):
+class OrderBookSnapshot(msgspec.Struct, gc=False):
     """Snapshot of a single order book level."""
 
     timestamp: datetime
@@ -110,7 +211,7 @@ class OrderBookSnapshot(BaseModel):
     size: float
 
 
-class TradeSnapshot(BaseModel):
+class TradeSnapshot(msgspec.Struct, gc=False):
     """Snapshot of a single trade."""
 
     timestamp: datetime
@@ -121,7 +222,7 @@ class TradeSnapshot(BaseModel):
     side: Optional[str] = None  # "buy" or "sell"
 
 
-class ResolutionSnapshot(BaseModel):
+class ResolutionSnapshot(msgspec.Struct):
     """Snapshot of a market resolution."""
 
     timestamp: datetime
@@ -131,7 +232,7 @@ class ResolutionSnapshot(BaseModel):
     resolution_source: Optional[str] = None
 
 
-class PriceChangeEvent(BaseModel):
+class PriceChangeEvent(msgspec.Struct, gc=False):
     """Real-time price change event from WebSocket."""
 
     timestamp: datetime
@@ -144,12 +245,12 @@ class PriceChangeEvent(BaseModel):
     best_ask: Optional[float] = None
 
 
-class BookEvent(BaseModel):
+class BookEvent(msgspec.Struct):
     """Full order book event from WebSocket."""
 
     timestamp: datetime
     market_id: str
     token_id: str
     hash: Optional[str] = None
-    bids: list = Field(default_factory=list)
-    asks: list = Field(default_factory=list)
+    bids: list = msgspec.field(default_factory=list)
+    asks: list = msgspec.field(default_factory=list)
@@ -0,0 +1,131 @@
+"""Parquet sink for market snapshots (optional, requires pyarrow).
+
+SQLite is the primary store; the Parquet files are an append-only copy laid
+out for fast columnar scans when backtesting.
+"""
+
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .models import MarketSnapshot
+
+logger = logging.getLogger(__name__)
+
+MARKET_SNAPSHOT_SCHEMA = pa.schema(
+    [
+        ("timestamp", pa.timestamp("ms", tz="UTC")),
+        ("market_id", pa.string()),
+        ("title", pa.string()),
+        ("category", pa.string()),
+        ("yes_price", pa.float64()),
+        ("no_price", pa.float64()),
+        ("parity_gap", pa.float64()),
+        ("best_bid", pa.float64()),
+        ("best_ask", pa.float64()),
+        ("spread", pa.float64()),
+        ("volume_24h", pa.float64()),
+        ("liquidity", pa.float64()),
+        ("end_time", pa.string()),
+        ("active", pa.bool_()),
+    ]
+)
+
+
+# Suffix of the file being written; renamed to .parquet once its footer is
+# written, so readers never see a half-written file
+_IN_PROGRESS_SUFFIX = ".inprogress"
+
+
+class ParquetSnapshotSink:
+    """Appends market snapshots to one Parquet file per UTC hour.
+
+    Rows are buffered and written as row groups of `row_group_size` rows
+    (or whatever is left when the file closes), so scans see a few large
+    row groups rather than one per recording cycle. A file is only readable
+    once closed (on hour rollover or close()); until then it is named
+    *.parquet.inprogress. An unclean shutdown loses at most the current
+    hour's file, and SQLite still has those rows.
+    """
+
+    def __init__(self, directory: str, row_group_size: int = 65_536):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.row_group_size = row_group_size
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._path: Optional[Path] = None
+        self._hour: Optional[str] = None
+        self._columns: Dict[str, list] = {
+            name: [] for name in MARKET_SNAPSHOT_SCHEMA.names
+        }
+        self._buffered = 0
+
+    def write(self, snapshots: List[MarketSnapshot]) -> None:
+        """Buffer one batch of snapshots (blocking; run off the event loop)."""
+        if not snapshots:
+            return
+
+        hour = snapshots[0].timestamp.strftime("%Y%m%d_%H")
+        if hour != self._hour:
+            self.close()
+            self._hour = hour
+
+        for snapshot in snapshots:
+            for name, values in self._columns.items():
+                values.append(getattr(snapshot, name))
+        self._buffered += len(snapshots)
+
+        if self._buffered >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write buffered rows to the current file as one row group."""
+        if not self._buffered:
+            return
+        if self._writer is None:
+            self._open()
+
+        self._writer.write_batch(
+            pa.RecordBatch.from_pydict(self._columns, schema=MARKET_SNAPSHOT_SCHEMA)
+        )
+        for values in self._columns.values():
+            values.clear()
+        self._buffered = 0
+
+    def _open(self) -> None:
+        """Start the file for the current hour."""
+        # Start time in the name keeps a restart within the hour from
+        # overwriting a file
+        path = self.directory / (
+            f"market_snapshots_{self._hour}_{datetime.utcnow():%H%M%S_%f}.parquet"
+        )
+        self._writer = pq.ParquetWriter(
+            f"{path}{_IN_PROGRESS_SUFFIX}", MARKET_SNAPSHOT_SCHEMA
+        )
+        self._path = path
+        logger.info(f"Writing Parquet snapshots to {path}")
+
+    def close(self) -> None:
+        """Flush buffered rows, finish the file and publish it."""
+        self._flush()
+        if self._writer:
+            self._writer.close()
+            Path(f"{self._path}{_IN_PROGRESS_SUFFIX}").replace(self._path)
+            self._writer = None
+            self._path = None
+        self._hour = None
+
+
+def read_market_snapshots(directory: str) -> pa.Table:
+    """Read all finished Parquet snapshot files in `directory` as one table.
+
+    Files still being written (or left behind by a crash) are skipped.
+    """
+    paths = [str(p) for p in sorted(Path(directory).glob("*.parquet"))]
+    if not paths:
+        return MARKET_SNAPSHOT_SCHEMA.empty_table()
+    return pq.read_table(paths, schema=MARKET_SNAPSHOT_SCHEMA)
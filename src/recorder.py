@@ -2,10 +2,16 @@
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from operator import itemgetter
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
 import aiosqlite
 import httpx
+import msgspec
 
 from .models import (
     Market,
@@ -21,6 +27,205 @@ from .gamma_client import GammaClient
 
 logger = logging.getLogger(__name__)
 
+# PRAGMA synchronous per durability level. off: no fsync, an OS crash or
+# power loss can corrupt the DB. normal: WAL-safe, the last commits may be
+# lost on power loss. full: fsync on every commit.
+_SYNCHRONOUS = {"off": "OFF", "normal": "NORMAL", "full": "FULL"}
+
+# Bumped when init_db migrates existing data (stored in PRAGMA user_version).
+# 1: timestamps converted from ISO-8601 text to INTEGER unix ms.
+_SCHEMA_VERSION = 1
+
+_TIMESTAMPED_TABLES = (
+    "market_snapshots",
+    "outcome_snapshots",
+    "orderbook_snapshots",
+    "trade_snapshots",
+    "resolution_snapshots",
+    "price_change_events",
+)
+
+# ISO-8601 text (naive = UTC, offsets honoured) -> unix ms; 2440587.5 is
+# the julian day of the unix epoch
+_SQL_ISO_TO_UNIX_MS = (
+    "CAST(round((julianday(timestamp) - 2440587.5) * 86400000) AS INTEGER)"
+)
+
+# Connection tuning applied in init_db (synchronous is set from durability)
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256MB
+    "PRAGMA cache_size=-65536",  # 64MB
+    "PRAGMA busy_timeout=5000",  # wait on locks (e.g. sqlite3 CLI readers)
+    "PRAGMA wal_autocheckpoint=1000",
+)
+
+# Reused for every WebSocket frame instead of building a decoder per call
+_WS_DECODER = msgspec.json.Decoder()
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Book levels always carry both fields; one C-level call fetches the pair
+_PRICE_SIZE = itemgetter("price", "size")
+
+# Outcome labels as Gamma spells them; set lookup avoids .lower() per token
+_YES = frozenset(("yes", "Yes", "YES"))
+_NO = frozenset(("no", "No", "NO"))
+
+
+# Rows in a batch share one timestamp object, so this converts once per batch
+@lru_cache(maxsize=1024)
+def _to_unix_ms(dt: datetime) -> int:
+    """Convert a datetime to integer unix milliseconds (naive = UTC)."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - _EPOCH) // timedelta(milliseconds=1)
+
+
+# Prepared once per connection (cached_statements) and shared by all writers
+_SQL_INSERT_MARKET = """
+    INSERT INTO market_snapshots
+    (timestamp, market_id, title, category, yes_price, no_price,
+     parity_gap, best_bid, best_ask, spread, volume_24h, liquidity,
+     end_time, active)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_OUTCOME = """
+    INSERT INTO outcome_snapshots
+    (timestamp, market_id, outcome, price, token_id)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_ORDERBOOK = """
+    INSERT INTO orderbook_snapshots
+    (timestamp, market_id, token_id, side, level, price, size)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_TRADE = """
+    INSERT INTO trade_snapshots
+    (timestamp, market_id, token_id, price, size, side)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_PRICE_CHANGE = """
+    INSERT INTO price_change_events
+    (timestamp, market_id, token_id, price, size, side, best_bid, best_ask)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_RESOLUTION = """
+    INSERT INTO resolution_snapshots
+    (timestamp, market_id, resolved, resolution_outcome, resolution_source)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def _market_row(snapshot: MarketSnapshot) -> tuple:
+    return (
+        _to_unix_ms(snapshot.timestamp),
+        snapshot.market_id,
+        snapshot.title,
+        snapshot.category,
+        snapshot.yes_price,
+        snapshot.no_price,
+        snapshot.parity_gap,
+        snapshot.best_bid,
+        snapshot.best_ask,
+        snapshot.spread,
+        snapshot.volume_24h,
+        snapshot.liquidity,
+        snapshot.end_time,
+        snapshot.active,
+    )
+
+
+def _outcome_row(snapshot: OutcomeSnapshot) -> tuple:
+    return (
+        _to_unix_ms(snapshot.timestamp),
+        snapshot.market_id,
+        snapshot.outcome,
+        snapshot.price,
+        snapshot.token_id,
+    )
+
+
+def _orderbook_row(snapshot: OrderBookSnapshot) -> tuple:
+    return (
+        _to_unix_ms(snapshot.timestamp),
+        snapshot.market_id,
+        snapshot.token_id,
+        snapshot.side,
+        snapshot.level,
+        snapshot.price,
+        snapshot.size,
+    )
+
+
+def _trade_row(snapshot: TradeSnapshot) -> tuple:
+    return (
+        _to_unix_ms(snapshot.timestamp),
+        snapshot.market_id,
+        snapshot.token_id,
+        snapshot.price,
+        snapshot.size,
+        snapshot.side,
+    )
+
+
+def _price_change_row(event: PriceChangeEvent) -> tuple:
+    return (
+        _to_unix_ms(event.timestamp),
+        event.market_id,
+        event.token_id,
+        event.price,
+        event.size,
+        event.side,
+        event.best_bid,
+        event.best_ask,
+    )
+
+
+def _resolution_row(snapshot: ResolutionSnapshot) -> tuple:
+    return (
+        _to_unix_ms(snapshot.timestamp),
+        snapshot.market_id,
+        snapshot.resolved,
+        snapshot.resolution_outcome,
+        snapshot.resolution_source,
+    )
+
+
+def _book_rows(
+    ts: int, market_id: str, token_id: str, side: str, levels: List[Dict[str, Any]]
+) -> List[tuple]:
+    """Order book rows for one side of a book frame.
+
+    A level missing price or size is logged and skipped; the rest of the
+    side is kept with its original level numbers.
+    """
+    # Prices and sizes arrive as strings, so float() stays
+    try:
+        return [
+            (ts, market_id, token_id, side, level, float(price), float(size))
+            for level, (price, size) in enumerate(map(_PRICE_SIZE, levels))
+        ]
+    except KeyError:
+        pass
+
+    # Rare malformed side: redo it level by level
+    rows = []
+    for level, entry in enumerate(levels):
+        try:
+            price, size = _PRICE_SIZE(entry)
+        except KeyError:
+            logger.warning(f"Skipping {side} level {level} for {token_id}: {entry}")
+            continue
+        rows.append((ts, market_id, token_id, side, level, float(price), float(size)))
+    return rows
+
 
 class DataRecorder:
     """Records Polymarket data snapshots for backtesting."""
@@ -32,6 +237,13 @@ class DataRecorder:
         min_volume: float = 1000.0,
         min_liquidity: float = 500.0,
         interval_seconds: int = 60,
+        max_markets: int = 100,
+        unsafe_fast: bool = False,
+        durability: str = "normal",
+        write_queue_size: int = 2_000,
+        write_batch_size: int = 500,
+        write_batch_wait_ms: int = 50,
+        parquet_dir: Optional[str] = None,
     ):
         """
         Initialize data recorder.
@@ -42,24 +254,101 @@ class DataRecorder:
             min_volume: Minimum 24h volume to record
             min_liquidity: Minimum liquidity to record
             interval_seconds: Recording interval in seconds
+            max_markets: Maximum number of markets to fetch per cycle
+            unsafe_fast: Shorthand for durability="off"
+            durability: SQLite sync level, "off", "normal" or "full". "off"
+                skips fsync entirely for throughput on refetchable data, but
+                an OS crash or power loss can corrupt the database
+            write_queue_size: Max buffered WebSocket events (one book frame
+                or price change message each, however many rows it holds)
+                before the stream reader waits on the DB writer
+            write_batch_size: Target WebSocket rows per transaction; a batch
+                stops taking events once it reaches this many rows
+            write_batch_wait_ms: How long the writer waits for more rows
+                before committing a partial batch
+            parquet_dir: If set, also append market snapshots to daily
+                Parquet files in this directory (requires pyarrow)
         """
         self.gamma_client = gamma_client
         self.db_path = db_path
         self.min_volume = min_volume
         self.min_liquidity = min_liquidity
         self.interval_seconds = interval_seconds
+        self.max_markets = max_markets
+        if unsafe_fast:
+            if durability not in ("normal", "off"):
+                raise ValueError(
+                    f"unsafe_fast conflicts with durability={durability!r}"
+                )
+            durability = "off"
+        if durability not in _SYNCHRONOUS:
+            raise ValueError(
+                f"durability must be one of {', '.join(_SYNCHRONOUS)}, got {durability!r}"
+            )
+        self.durability = durability
+        self.write_batch_size = write_batch_size
+        self.write_batch_wait_ms = write_batch_wait_ms
+        self.parquet_dir = parquet_dir
         self._db: Optional[aiosqlite.Connection] = None
+        # Serialises transactions on the shared connection
+        self._db_lock = asyncio.Lock()
+        # (insert SQL, rows) per WebSocket event
+        self._write_queue: "asyncio.Queue[Tuple[str, List[tuple]]]" = asyncio.Queue(
+            maxsize=write_queue_size
+        )
+        self._writer_task: Optional[asyncio.Task] = None
+        # Stream batches are written on their own thread and connection so
+        # grouping rows and SQLite work never run on the event loop
+        self._db_executor: Optional[ThreadPoolExecutor] = None
+        self._stream_db: Optional[sqlite3.Connection] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._parquet = None
+        # Set only once init_db has completed every step
+        self._initialized = False
         self._running = False
 
     async def init_db(self) -> None:
-        """Initialize database with schema."""
-        self._db = await aiosqlite.connect(self.db_path)
+        """Initialize database with schema.
+
+        If any step fails, everything opened so far is closed again before
+        the error propagates.
+        """
+        if self._initialized:
+            return
+
+        try:
+            await self._setup()
+        except BaseException:
+            await self.close()
+            raise
+        self._initialized = True
+
+    async def _setup(self) -> None:
+        """Open sinks and connections and create the schema (see init_db)."""
+        # Optional sink first, so a missing pyarrow fails before anything
+        # is opened
+        if self.parquet_dir:
+            try:
+                from .parquet_sink import ParquetSnapshotSink
+            except ImportError as e:
+                raise ImportError(
+                    "parquet_dir requires pyarrow (pip install pyarrow)"
+                ) from e
+
+            self._parquet = ParquetSnapshotSink(self.parquet_dir)
+
+        # One connection for the recorder's lifetime; the larger statement
+        # cache keeps every INSERT/query prepared across cycles
+        self._db = await aiosqlite.connect(self.db_path, cached_statements=256)
+
+        for pragma in self._pragmas():
+            await self._db.execute(pragma)
 
         # Create tables
         await self._db.execute("""
             CREATE TABLE IF NOT EXISTS market_snapshots (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME NOT NULL,
+                timestamp INTEGER NOT NULL,  -- unix ms, UTC
                 market_id TEXT NOT NULL,
                 title TEXT,
                 category TEXT,
@@ -79,7 +368,7 @@ class DataRecorder:
         await self._db.execute("""
             CREATE TABLE IF NOT EXISTS outcome_snapshots (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME NOT NULL,
+                timestamp INTEGER NOT NULL,  -- unix ms, UTC
                 market_id TEXT NOT NULL,
                 outcome TEXT,
                 price REAL,
@@ -90,7 +379,7 @@ class DataRecorder:
         await self._db.execute("""
             CREATE TABLE IF NOT EXISTS orderbook_snapshots (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME NOT NULL,
+                timestamp INTEGER NOT NULL,  -- unix ms, UTC
                 market_id TEXT NOT NULL,
                 token_id TEXT NOT NULL,
                 side TEXT,
@@ -103,7 +392,7 @@ class DataRecorder:
         await self._db.execute("""
             CREATE TABLE IF NOT EXISTS trade_snapshots (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME NOT NULL,
+                timestamp INTEGER NOT NULL,  -- unix ms, UTC
                 market_id TEXT NOT NULL,
                 token_id TEXT NOT NULL,
                 price REAL,
@@ -115,7 +404,7 @@ class DataRecorder:
         await self._db.execute("""
             CREATE TABLE IF NOT EXISTS resolution_snapshots (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME NOT NULL,
+                timestamp INTEGER NOT NULL,  -- unix ms, UTC
                 market_id TEXT NOT NULL,
                 resolved BOOLEAN,
                 resolution_outcome TEXT,
@@ -126,7 +415,7 @@ class DataRecorder:
         await self._db.execute("""
             CREATE TABLE IF NOT EXISTS price_change_events (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME NOT NULL,
+                timestamp INTEGER NOT NULL,  -- unix ms, UTC
                 market_id TEXT NOT NULL,
                 token_id TEXT NOT NULL,
                 price REAL,
@@ -137,12 +426,25 @@ class DataRecorder:
             )
         """)
 
-        # Create indexes
+        await self._migrate_legacy_timestamps()
+
+        # Create indexes. (market_id, timestamp) serves per-market range
+        # queries; the timestamp index stays for "latest N" scans across
+        # markets. Stream tables are only looked up per token over time.
+        for name in (
+            "idx_market_snap_id",
+            "idx_book_snap_time",
+            "idx_trade_snap_time",
+            "idx_price_change_time",
+            "idx_price_change_token",
+        ):
+            await self._db.execute(f"DROP INDEX IF EXISTS {name}")
         await self._db.execute(
-            "CREATE INDEX IF NOT EXISTS idx_market_snap_time ON market_snapshots(timestamp)"
+            "CREATE INDEX IF NOT EXISTS idx_market_snap_mid_ts "
+            "ON market_snapshots(market_id, timestamp DESC)"
         )
         await self._db.execute(
-            "CREATE INDEX IF NOT EXISTS idx_market_snap_id ON market_snapshots(market_id)"
+            "CREATE INDEX IF NOT EXISTS idx_market_snap_time ON market_snapshots(timestamp)"
         )
         await self._db.execute(
             "CREATE INDEX IF NOT EXISTS idx_market_snap_gap ON market_snapshots(parity_gap)"
@@ -151,37 +453,146 @@ class DataRecorder:
             "CREATE INDEX IF NOT EXISTS idx_outcome_snap_time ON outcome_snapshots(timestamp)"
         )
         await self._db.execute(
-            "CREATE INDEX IF NOT EXISTS idx_book_snap_time ON orderbook_snapshots(timestamp)"
-        )
-        await self._db.execute(
-            "CREATE INDEX IF NOT EXISTS idx_trade_snap_time ON trade_snapshots(timestamp)"
+            "CREATE INDEX IF NOT EXISTS idx_book_snap_token_ts "
+            "ON orderbook_snapshots(token_id, timestamp)"
         )
         await self._db.execute(
-            "CREATE INDEX IF NOT EXISTS idx_price_change_time ON price_change_events(timestamp)"
+            "CREATE INDEX IF NOT EXISTS idx_trade_snap_token_ts "
+            "ON trade_snapshots(token_id, timestamp)"
         )
         await self._db.execute(
-            "CREATE INDEX IF NOT EXISTS idx_price_change_token ON price_change_events(token_id)"
+            "CREATE INDEX IF NOT EXISTS idx_price_change_token_ts "
+            "ON price_change_events(token_id, timestamp)"
         )
 
         await self._db.commit()
         logger.info(f"Database initialized at {self.db_path}")
 
+        # Single writer for streamed rows; runs until close()
+        self._db_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="stream-writer"
+        )
+        await asyncio.get_running_loop().run_in_executor(
+            self._db_executor, self._open_stream_db
+        )
+        self._writer_task = asyncio.create_task(self._writer_loop())
+
+    def _open_stream_db(self) -> None:
+        """Open the stream writer's connection (runs on the writer thread)."""
+        # Autocommit mode; _blocking_write_batch issues BEGIN/COMMIT itself
+        conn = sqlite3.connect(
+            self.db_path, isolation_level=None, cached_statements=256
+        )
+        for pragma in self._pragmas():
+            conn.execute(pragma)
+        self._stream_db = conn
+
+    def _pragmas(self) -> Tuple[str, ...]:
+        """PRAGMAs applied to every connection this recorder opens."""
+        # Sync level comes from durability; see _SYNCHRONOUS for the
+        # crash-safety tradeoff of each (WAL + NORMAL is the default)
+        return (f"PRAGMA synchronous={_SYNCHRONOUS[self.durability]}",) + _PRAGMAS
+
+    async def _migrate_legacy_timestamps(self) -> None:
+        """Convert ISO text timestamps written by older versions to unix ms.
+
+        Older tables declare timestamp as DATETIME (numeric affinity), so the
+        converted values are stored as integers without rebuilding the table.
+        Runs once per database, tracked by PRAGMA user_version; commits with
+        the rest of init_db. Text that julianday() can't parse is left as is
+        (and logged) rather than blocking startup.
+        """
+        cursor = await self._db.execute("PRAGMA user_version")
+        (version,) = await cursor.fetchone()
+        if version >= _SCHEMA_VERSION:
+            return
+
+        for table in _TIMESTAMPED_TABLES:
+            cursor = await self._db.execute(
+                f"UPDATE {table} SET timestamp = {_SQL_ISO_TO_UNIX_MS} "
+                "WHERE typeof(timestamp) = 'text' "
+                "AND julianday(timestamp) IS NOT NULL"
+            )
+            if cursor.rowcount > 0:
+                logger.info(
+                    f"Converted {cursor.rowcount} {table} timestamps to unix ms"
+                )
+
+            cursor = await self._db.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE typeof(timestamp) = 'text'"
+            )
+            (unparsed,) = await cursor.fetchone()
+            if unparsed:
+                logger.warning(
+                    f"Left {unparsed} unparseable {table} timestamps as text; "
+                    f"find them with: SELECT * FROM {table} "
+                    "WHERE typeof(timestamp) = 'text'"
+                )
+
+        await self._db.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+
+    @asynccontextmanager
+    async def _transaction(self) -> AsyncIterator[None]:
+        """Run the body as one BEGIN IMMEDIATE ... COMMIT on the shared connection.
+
+        IMMEDIATE takes the write lock up front, so the transaction can't
+        fail later trying to upgrade a read lock. Rolls back on error.
+        """
+        if not self._db:
+            raise RuntimeError("Database not initialized. Call init_db() first.")
+
+        async with self._db_lock:
+            await self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                await self._db.rollback()
+                raise
+            await self._db.commit()
+
     async def close(self) -> None:
-        """Close database connection."""
+        """Flush queued writes and close database and HTTP connections."""
+        self._initialized = False
+
+        if self._writer_task:
+            await self._write_queue.join()
+            self._writer_task.cancel()
+            self._writer_task = None
+
+        if self._db_executor:
+            if self._stream_db:
+                await asyncio.get_running_loop().run_in_executor(
+                    self._db_executor, self._stream_db.close
+                )
+            self._db_executor.shutdown()
+            self._db_executor = None
+            self._stream_db = None
+
         if self._db:
             await self._db.close()
             self._db = None
 
+        if self._http:
+            await self._http.aclose()
+            self._http = None
+
+        if self._parquet:
+            await asyncio.to_thread(self._parquet.close)
+            self._parquet = None
+
     async def fetch_markets(self) -> List[Market]:
         """Fetch and filter markets from Polymarket."""
-        markets = await self.gamma_client.fetch_markets(active_only=True)
+        markets = await self.gamma_client.fetch_all_markets(
+            total_limit=self.max_markets,
+            active_only=True,
+            min_volume=self.min_volume,
+            min_liquidity=self.min_liquidity,
+        )
 
-        # Apply filters
-        filtered = [
-            m
-            for m in markets
-            if m.volume_24h >= self.min_volume and m.liquidity >= self.min_liquidity
-        ]
+        # The API filters server-side; re-check locally in case it ignores them
+        filtered = self.gamma_client.filter_markets(
+            markets, min_volume=self.min_volume, min_liquidity=self.min_liquidity
+        )
 
         logger.debug(f"Fetched {len(markets)} markets, {len(filtered)} pass filters")
         return filtered
@@ -192,23 +603,27 @@ class DataRecorder:
         snapshots = []
 
         for market in markets:
+            # For 2-outcome markets only; skip before scanning tokens
+            if len(market.tokens) != 2:
+                continue
+
             # Get YES and NO prices
             yes_price = 0.0
             no_price = 0.0
 
             for token in market.tokens:
-                if token.outcome.lower() == "yes":
+                outcome = token.outcome
+                if outcome in _YES:
                     yes_price = token.price
-                elif token.outcome.lower() == "no":
+                elif outcome in _NO:
                     no_price = token.price
 
-            # For 2-outcome markets only
-            if len(market.tokens) == 2 and yes_price > 0:
+            if yes_price > 0:
                 snapshot = MarketSnapshot(
                     timestamp=timestamp,
                     market_id=market.market_id,
                     title=market.title,
-                    category=getattr(market, "category", None),
+                    category=market.category,
                     yes_price=yes_price,
                     no_price=no_price,
                     best_bid=market.best_bid,
@@ -216,7 +631,7 @@ class DataRecorder:
                     volume_24h=market.volume_24h,
                     liquidity=market.liquidity,
                     end_time=market.end_time,
-                    active=getattr(market, "active", None),
+                    active=market.active,
                 )
                 snapshots.append(snapshot)
 
@@ -242,63 +657,34 @@ class DataRecorder:
 
         return snapshots
 
-    async def save_snapshots(self, snapshots: List[MarketSnapshot]) -> None:
+    async def save_snapshots(
+        self, snapshots: List[MarketSnapshot], commit: bool = True
+    ) -> None:
         """Save market snapshots to database."""
         if not self._db:
             raise RuntimeError("Database not initialized. Call init_db() first.")
 
-        for snapshot in snapshots:
-            await self._db.execute(
-                """
-                INSERT INTO market_snapshots
-                (timestamp, market_id, title, category, yes_price, no_price,
-                 parity_gap, best_bid, best_ask, spread, volume_24h, liquidity,
-                 end_time, active)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    snapshot.timestamp.isoformat(),
-                    snapshot.market_id,
-                    snapshot.title,
-                    snapshot.category,
-                    snapshot.yes_price,
-                    snapshot.no_price,
-                    snapshot.parity_gap,
-                    snapshot.best_bid,
-                    snapshot.best_ask,
-                    snapshot.spread,
-                    snapshot.volume_24h,
-                    snapshot.liquidity,
-                    snapshot.end_time,
-                    snapshot.active,
-                ),
-            )
+        await self._db.executemany(
+            _SQL_INSERT_MARKET, [_market_row(s) for s in snapshots]
+        )
 
-        await self._db.commit()
+        if commit:
+            await self._db.commit()
         logger.debug(f"Saved {len(snapshots)} market snapshots")
 
-    async def save_outcome_snapshots(self, snapshots: List[OutcomeSnapshot]) -> None:
+    async def save_outcome_snapshots(
+        self, snapshots: List[OutcomeSnapshot], commit: bool = True
+    ) -> None:
         """Save outcome snapshots to database."""
         if not self._db:
             raise RuntimeError("Database not initialized. Call init_db() first.")
 
-        for snapshot in snapshots:
-            await self._db.execute(
-                """
-                INSERT INTO outcome_snapshots
-                (timestamp, market_id, outcome, price, token_id)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    snapshot.timestamp.isoformat(),
-                    snapshot.market_id,
-                    snapshot.outcome,
-                    snapshot.price,
-                    snapshot.token_id,
-                ),
-            )
+        await self._db.executemany(
+            _SQL_INSERT_OUTCOME, [_outcome_row(s) for s in snapshots]
+        )
 
-        await self._db.commit()
+        if commit:
+            await self._db.commit()
         logger.debug(f"Saved {len(snapshots)} outcome snapshots")
 
     async def query_snapshots(
@@ -321,11 +707,11 @@ class DataRecorder:
 
         if start_time:
             query += " AND timestamp >= ?"
-            params.append(start_time.isoformat())
+            params.append(_to_unix_ms(start_time))
 
         if end_time:
             query += " AND timestamp <= ?"
-            params.append(end_time.isoformat())
+            params.append(_to_unix_ms(end_time))
 
         query += f" ORDER BY timestamp DESC LIMIT {limit}"
 
@@ -335,7 +721,7 @@ class DataRecorder:
         snapshots = []
         for row in rows:
             snapshot = MarketSnapshot(
-                timestamp=datetime.fromisoformat(row[1]),
+                timestamp=datetime.utcfromtimestamp(row[1] / 1000),
                 market_id=row[2],
                 title=row[3],
                 category=row[4],
@@ -356,15 +742,37 @@ class DataRecorder:
     # Order Book Methods
     # =========================================================================
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the shared CLOB HTTP client, creating it on first use."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=30.0,
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=128, max_keepalive_connections=64
+                ),
+            )
+        return self._http
+
     async def _fetch_order_book(self, token_id: str) -> Dict[str, Any]:
         """Fetch order book from CLOB API."""
         url = "https://clob.polymarket.com/book"
         params = {"token_id": token_id}
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+        response = await self._get_http_client().get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch_order_books(self, token_ids: List[str]) -> List[Any]:
+        """Fetch order books for several tokens concurrently.
+
+        Returns one entry per token, in order: the book data, or the
+        exception raised while fetching it.
+        """
+        return await asyncio.gather(
+            *(self._fetch_order_book(token_id) for token_id in token_ids),
+            return_exceptions=True,
+        )
 
     def create_orderbook_snapshots(
         self,
@@ -411,30 +819,19 @@ class DataRecorder:
 
         return snapshots
 
-    async def save_orderbook_snapshots(self, snapshots: List[OrderBookSnapshot]) -> None:
+    async def save_orderbook_snapshots(
+        self, snapshots: List[OrderBookSnapshot], commit: bool = True
+    ) -> None:
         """Save order book snapshots to database."""
         if not self._db:
             raise RuntimeError("Database not initialized. Call init_db() first.")
 
-        for snapshot in snapshots:
-            await self._db.execute(
-                """
-                INSERT INTO orderbook_snapshots
-                (timestamp, market_id, token_id, side, level, price, size)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    snapshot.timestamp.isoformat(),
-                    snapshot.market_id,
-                    snapshot.token_id,
-                    snapshot.side,
-                    snapshot.level,
-                    snapshot.price,
-                    snapshot.size,
-                ),
-            )
+        await self._db.executemany(
+            _SQL_INSERT_ORDERBOOK, [_orderbook_row(s) for s in snapshots]
+        )
 
-        await self._db.commit()
+        if commit:
+            await self._db.commit()
         logger.debug(f"Saved {len(snapshots)} order book snapshots")
 
     # =========================================================================
@@ -465,29 +862,19 @@ class DataRecorder:
 
         return snapshots
 
-    async def save_trade_snapshots(self, snapshots: List[TradeSnapshot]) -> None:
+    async def save_trade_snapshots(
+        self, snapshots: List[TradeSnapshot], commit: bool = True
+    ) -> None:
         """Save trade snapshots to database."""
         if not self._db:
             raise RuntimeError("Database not initialized. Call init_db() first.")
 
-        for snapshot in snapshots:
-            await self._db.execute(
-                """
-                INSERT INTO trade_snapshots
-                (timestamp, market_id, token_id, price, size, side)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    snapshot.timestamp.isoformat(),
-                    snapshot.market_id,
-                    snapshot.token_id,
-                    snapshot.price,
-                    snapshot.size,
-                    snapshot.side,
-                ),
-            )
+        await self._db.executemany(
+            _SQL_INSERT_TRADE, [_trade_row(s) for s in snapshots]
+        )
 
-        await self._db.commit()
+        if commit:
+            await self._db.commit()
         logger.debug(f"Saved {len(snapshots)} trade snapshots")
 
     # =========================================================================
@@ -495,16 +882,21 @@ class DataRecorder:
     # =========================================================================
 
     def _parse_ws_timestamp(self, ts: Any) -> datetime:
-        """Parse WebSocket timestamp (unix ms or ISO string)."""
-        if ts is None:
-            return datetime.utcnow()
-        if isinstance(ts, (int, float)):
-            return datetime.utcfromtimestamp(ts / 1000)
-        if isinstance(ts, str):
+        """Parse WebSocket timestamp (unix ms as number or string, or ISO)."""
+        # Exact type checks, most common first: the market channel sends
+        # unix ms as a digit string, other feeds send numbers
+        t = type(ts)
+        if t is str:
+            if ts.isdecimal():
+                return datetime.utcfromtimestamp(int(ts) / 1000)
             try:
-                return datetime.fromisoformat(ts.replace("Z", "+00:00"))
+                if ts.endswith("Z"):
+                    ts = ts[:-1] + "+00:00"
+                return datetime.fromisoformat(ts)
             except ValueError:
-                pass
+                return datetime.utcnow()
+        if t is int or t is float:
+            return datetime.utcfromtimestamp(ts / 1000)
         return datetime.utcnow()
 
     def handle_trade_message(self, message: Dict[str, Any]) -> Optional[TradeSnapshot]:
@@ -523,8 +915,11 @@ class DataRecorder:
         events = []
         timestamp = self._parse_ws_timestamp(message.get("timestamp"))
         market_id = message.get("market", "")
+        # Shared by every change in the message, so convert once
         best_bid = message.get("best_bid")
+        best_bid = float(best_bid) if best_bid else None
         best_ask = message.get("best_ask")
+        best_ask = float(best_ask) if best_ask else None
 
         for change in message.get("price_changes", []):
             events.append(
@@ -535,8 +930,8 @@ class DataRecorder:
                     price=float(change.get("price", 0)),
                     size=float(change.get("size", 0)),
                     side=change.get("side", ""),
-                    best_bid=float(best_bid) if best_bid else None,
-                    best_ask=float(best_ask) if best_ask else None,
+                    best_bid=best_bid,
+                    best_ask=best_ask,
                 )
             )
         return events
@@ -552,32 +947,126 @@ class DataRecorder:
             asks=message.get("asks", []),
         )
 
-    async def save_price_change_events(self, events: List[PriceChangeEvent]) -> None:
+    async def save_price_change_events(
+        self, events: List[PriceChangeEvent], commit: bool = True
+    ) -> None:
         """Save price change events to database."""
         if not self._db:
             return
 
-        for event in events:
-            await self._db.execute(
-                """
-                INSERT INTO price_change_events
-                (timestamp, market_id, token_id, price, size, side, best_bid, best_ask)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    event.timestamp.isoformat(),
-                    event.market_id,
-                    event.token_id,
-                    event.price,
-                    event.size,
-                    event.side,
-                    event.best_bid,
-                    event.best_ask,
-                ),
-            )
-        await self._db.commit()
+        await self._db.executemany(
+            _SQL_INSERT_PRICE_CHANGE, [_price_change_row(e) for e in events]
+        )
+        if commit:
+            await self._db.commit()
 
-    async def connect_market_stream(self, token_ids: List[str]) -> None:
+    async def _enqueue_rows(self, sql: str, rows: List[tuple]) -> None:
+        """Queue one event's rows for the stream writer (waits if full)."""
+        await self._write_queue.put((sql, rows))
+
+    async def _write_batch(self, batch: List[Tuple[str, List[tuple]]]) -> None:
+        """Write queued rows on the stream writer thread."""
+        await asyncio.get_running_loop().run_in_executor(
+            self._db_executor, self._blocking_write_batch, batch
+        )
+
+    def _blocking_write_batch(self, batch: List[Tuple[str, List[tuple]]]) -> None:
+        """Write rows with one executemany per table and one commit.
+
+        Runs on the writer thread. Concurrent writes from the main
+        connection are serialised by SQLite itself (busy_timeout).
+        """
+        rows_by_sql: Dict[str, List[tuple]] = {}
+        for sql, rows in batch:
+            rows_by_sql.setdefault(sql, []).extend(rows)
+
+        conn = self._stream_db
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, rows in rows_by_sql.items():
+                conn.executemany(sql, rows)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    async def _writer_loop(self) -> None:
+        """Drain the stream write queue into the database in batches."""
+        while True:
+            batch = [await self._write_queue.get()]
+            row_count = len(batch[0][1])
+            lingered = False
+            while row_count < self.write_batch_size:
+                if self._write_queue.empty():
+                    if lingered:
+                        break
+                    # Linger briefly so a burst of messages shares one transaction
+                    await asyncio.sleep(self.write_batch_wait_ms / 1000)
+                    lingered = True
+                    continue
+                item = self._write_queue.get_nowait()
+                batch.append(item)
+                row_count += len(item[1])
+
+            try:
+                await self._write_batch(batch)
+                logger.debug(f"Wrote {row_count} stream rows")
+            except Exception as e:
+                logger.error(f"Failed to write {row_count} stream rows: {e}")
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+
+    async def ingest_book_frame(self, data: Dict[str, Any]) -> int:
+        """Queue order book rows straight from a WebSocket book frame.
+
+        Builds row tuples directly, skipping the BookEvent and
+        OrderBookSnapshot objects on this hot path. Returns rows queued.
+        """
+        ts = _to_unix_ms(self._parse_ws_timestamp(data.get("timestamp")))
+        market_id = data.get("market", "")
+        token_id = data.get("asset_id", "")
+
+        rows = _book_rows(ts, market_id, token_id, "bid", data.get("bids", []))
+        rows += _book_rows(ts, market_id, token_id, "ask", data.get("asks", []))
+
+        if rows and self._db:
+            await self._enqueue_rows(_SQL_INSERT_ORDERBOOK, rows)
+        return len(rows)
+
+    async def _handle_market_event(
+        self, data: Dict[str, Any], stats: Dict[str, int]
+    ) -> None:
+        """Queue rows for one market-channel event and update stream stats."""
+        event_type = data.get("event_type", "")
+
+        if event_type == "book":
+            await self.ingest_book_frame(data)
+            stats["book"] += 1
+
+        elif event_type == "price_change":
+            events = self.handle_price_change(data)
+            if events and self._db:
+                await self._enqueue_rows(
+                    _SQL_INSERT_PRICE_CHANGE,
+                    [_price_change_row(e) for e in events],
+                )
+            stats["price_change"] += len(events)
+
+        elif event_type == "last_trade_price":
+            trade = self.handle_trade_message(data)
+            if trade and self._db:
+                await self._enqueue_rows(
+                    _SQL_INSERT_TRADE, [_trade_row(trade)]
+                )
+            stats["last_trade_price"] += 1
+
+        else:
+            stats["other"] += 1
+
+    async def connect_market_stream(
+        self, token_ids: List[str], tokens_per_connection: int = 50
+    ) -> None:
         """
         Connect to CLOB WebSocket for real-time market data.
 
@@ -585,25 +1074,43 @@ class DataRecorder:
         - book: Full order book snapshot
         - price_change: Order placed/cancelled
         - last_trade_price: Trade execution
+
+        Tokens are spread over one socket per `tokens_per_connection` so
+        a large subscription isn't limited by a single socket's receive
+        loop. Rows from every socket are queued for the one DB writer task
+        (see _writer_loop), so socket reads never wait on a commit.
         """
-        import websockets
-        import json
+        chunks = [
+            token_ids[i:i + tokens_per_connection]
+            for i in range(0, len(token_ids), tokens_per_connection)
+        ]
+        logger.info(
+            f"Connecting to market stream for {len(token_ids)} tokens "
+            f"over {len(chunks)} connection(s)"
+        )
 
-        ws_url = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+        stats = {"book": 0, "price_change": 0, "last_trade_price": 0, "other": 0}
+        await asyncio.gather(
+            *(self._run_market_socket(chunk, stats) for chunk in chunks)
+        )
 
-        logger.info(f"Connecting to market stream for {len(token_ids)} tokens")
+    async def _run_market_socket(
+        self, token_ids: List[str], stats: Dict[str, int]
+    ) -> None:
+        """Subscribe one socket to `token_ids` and process it until stopped."""
+        import websockets
 
-        stats = {"book": 0, "price_change": 0, "last_trade_price": 0, "other": 0}
+        ws_url = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
 
         while self._running:
             try:
                 async with websockets.connect(ws_url, ping_interval=30) as ws:
-                    # Subscribe to all tokens
+                    # Subscribe to this connection's tokens
                     subscribe_msg = {
                         "type": "Market",
                         "assets_ids": token_ids,
                     }
-                    await ws.send(json.dumps(subscribe_msg))
+                    await ws.send(msgspec.json.encode(subscribe_msg).decode())
                     logger.info(f"Subscribed to {len(token_ids)} tokens")
 
                     # Process incoming messages
@@ -612,64 +1119,24 @@ class DataRecorder:
                             break
 
                         try:
-                            data = json.loads(message)
-                            event_type = data.get("event_type", "")
-
-                            if event_type == "book":
-                                book = self.handle_book_event(data)
-                                snapshots = []
-                                for level, bid in enumerate(book.bids):
-                                    snapshots.append(
-                                        OrderBookSnapshot(
-                                            timestamp=book.timestamp,
-                                            market_id=book.market_id,
-                                            token_id=book.token_id,
-                                            side="bid",
-                                            level=level,
-                                            price=float(bid.get("price", 0)),
-                                            size=float(bid.get("size", 0)),
-                                        )
-                                    )
-                                for level, ask in enumerate(book.asks):
-                                    snapshots.append(
-                                        OrderBookSnapshot(
-                                            timestamp=book.timestamp,
-                                            market_id=book.market_id,
-                                            token_id=book.token_id,
-                                            side="ask",
-                                            level=level,
-                                            price=float(ask.get("price", 0)),
-                                            size=float(ask.get("size", 0)),
-                                        )
-                                    )
-                                if snapshots and self._db:
-                                    await self.save_orderbook_snapshots(snapshots)
-                                stats["book"] += 1
-
-                            elif event_type == "price_change":
-                                events = self.handle_price_change(data)
-                                if events and self._db:
-                                    await self.save_price_change_events(events)
-                                stats["price_change"] += len(events)
-
-                            elif event_type == "last_trade_price":
-                                trade = self.handle_trade_message(data)
-                                if trade and self._db:
-                                    await self.save_trade_snapshots([trade])
-                                stats["last_trade_price"] += 1
-
-                            else:
-                                stats["other"] += 1
-
-                            # Log stats periodically
-                            total = sum(stats.values())
-                            if total > 0 and total % 100 == 0:
-                                logger.info(f"WebSocket stats: {stats}")
-
-                        except json.JSONDecodeError:
+                            data = _WS_DECODER.decode(message)
+                        except msgspec.DecodeError:
                             logger.warning("Invalid JSON in WebSocket message")
-                        except Exception as e:
-                            logger.error(f"Error processing message: {e}")
+                            continue
+
+                        # Some frames (e.g. the initial books) are arrays of
+                        # events; each one fails on its own so a bad event
+                        # doesn't drop the rest of the frame
+                        for event in data if isinstance(data, list) else [data]:
+                            try:
+                                await self._handle_market_event(event, stats)
+                            except Exception as e:
+                                logger.error(f"Error processing message: {e}")
+
+                        # Log stats periodically
+                        total = sum(stats.values())
+                        if total > 0 and total % 100 == 0:
+                            logger.info(f"WebSocket stats: {stats}")
 
             except Exception as e:
                 logger.error(f"WebSocket error: {e}, reconnecting in 5s...")
@@ -684,29 +1151,18 @@ class DataRecorder:
     # =========================================================================
 
     async def save_resolution_snapshots(
-        self, snapshots: List[ResolutionSnapshot]
+        self, snapshots: List[ResolutionSnapshot], commit: bool = True
     ) -> None:
         """Save resolution snapshots to database."""
         if not self._db:
             raise RuntimeError("Database not initialized. Call init_db() first.")
 
-        for snapshot in snapshots:
-            await self._db.execute(
-                """
-                INSERT INTO resolution_snapshots
-                (timestamp, market_id, resolved, resolution_outcome, resolution_source)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    snapshot.timestamp.isoformat(),
-                    snapshot.market_id,
-                    snapshot.resolved,
-                    snapshot.resolution_outcome,
-                    snapshot.resolution_source,
-                ),
-            )
+        await self._db.executemany(
+            _SQL_INSERT_RESOLUTION, [_resolution_row(s) for s in snapshots]
+        )
 
-        await self._db.commit()
+        if commit:
+            await self._db.commit()
         logger.debug(f"Saved {len(snapshots)} resolution snapshots")
 
     # =========================================================================
@@ -717,15 +1173,20 @@ class DataRecorder:
         """Perform one recording cycle. Returns number of snapshots saved."""
         markets = await self.fetch_markets()
 
-        # Create and save market snapshots
         market_snapshots = self.create_snapshots(markets)
-        if market_snapshots:
-            await self.save_snapshots(market_snapshots)
-
-        # Create and save outcome snapshots for multi-outcome markets
         outcome_snapshots = self.create_outcome_snapshots(markets)
-        if outcome_snapshots:
-            await self.save_outcome_snapshots(outcome_snapshots)
+
+        # Write the whole cycle in one transaction (one fsync per cycle)
+        if market_snapshots or outcome_snapshots:
+            async with self._transaction():
+                if market_snapshots:
+                    await self.save_snapshots(market_snapshots, commit=False)
+                if outcome_snapshots:
+                    await self.save_outcome_snapshots(outcome_snapshots, commit=False)
+
+        # Mirror committed snapshots to Parquet off the event loop
+        if self._parquet and market_snapshots:
+            await asyncio.to_thread(self._parquet.write, market_snapshots)
 
         logger.info(
             f"Recorded {len(market_snapshots)} markets, "